@@ -1,22 +1,29 @@
+import asyncio
 import logging
 import os
-import base64
+import hashlib
+import json
 from pathlib import Path
 from functools import lru_cache
-from time import perf_counter
+from typing import Annotated
+from time import monotonic, perf_counter
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import instructor
-from litellm import completion
+import msgspec
+import pybase64 as base64
+from instructor.cache import AutoCache
+from litellm import acompletion
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
 
 from pass_generator import PassGenerator
 from data.models import PassParams
@@ -31,6 +38,7 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
 TEMPLATES_DIR = BASE_DIR / "templates"
+LLM_INSTRUCTION_PATH = BASE_DIR / "data" / "llm_instruction.md"
 
 if not STATIC_DIR.exists():
     raise RuntimeError(f"Static directory not found: {STATIC_DIR}")
@@ -43,12 +51,106 @@ def get_llm_instruction() -> str:
     try:
         return LLM_INSTRUCTION_PATH.read_text(encoding="utf-8")
     except FileNotFoundError:
-        logger.error(f"LLM instruction file not found: {LLM_INSTRUCTION_PATH}")
+        logger.error("LLM instruction file not found: %s", LLM_INSTRUCTION_PATH)
         raise
 
 
-client = instructor.from_litellm(completion, mode=instructor.Mode.JSON)
+client = instructor.from_litellm(acompletion, mode=instructor.Mode.JSON)
+
+
+def build_response_model(model: type[BaseModel]) -> type[BaseModel]:
+    # instructor derives a new wrapper class from the response model, and
+    # regenerates its JSON schema, on every call. Wrapping it once here makes
+    # instructor reuse the wrapper. The schema is serialised once, and each
+    # caller gets its own copy because instructor edits the schema it is given.
+    wrapped = instructor.openai_schema(model)
+    schema_json = json.dumps(wrapped.model_json_schema())
+    wrapped.model_json_schema = classmethod(lambda cls: json.loads(schema_json))
+    return wrapped
+
+
+pass_params_model = build_response_model(PassParams)
 pass_generator = PassGenerator()
+PASS_GENERATORS = {
+    "password": pass_generator.generate_password,
+    "passphrase": pass_generator.generate_passphrase,
+}
+params_cache = AutoCache(maxsize=int(os.getenv("LLM_CACHE_SIZE", "4096")))
+pending_pass_configs: dict[str, asyncio.Task[PassParams]] = {}
+
+
+@lru_cache(maxsize=1)
+def get_params_cache_namespace() -> str:
+    payload = json.dumps(
+        [LLM_MODEL, get_llm_instruction(), PassParams.model_json_schema()],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_input(user_input: str) -> str:
+    return " ".join(user_input.split())
+
+
+def build_system_message(instruction: str) -> dict:
+    if not LLM_PROMPT_CACHE:
+        return {"role": "system", "content": instruction}
+
+    # Marks the instruction for provider-side prompt caching; litellm maps
+    # cache_control to each provider's own mechanism (e.g. Gemini context caching).
+    return {
+        "role": "system",
+        "content": [
+            {
+                "type": "text",
+                "text": instruction,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+    }
+
+
+async def request_pass_config(user_input: str) -> PassParams:
+    return await client.chat.completions.create(
+        model=LLM_MODEL,
+        api_key=API_KEY,
+        messages=[
+            build_system_message(get_llm_instruction()),
+            {"role": "user", "content": user_input},
+        ],
+        response_model=pass_params_model,
+        max_retries=2,
+    )
+
+
+async def resolve_pass_config(user_input: str) -> PassParams:
+    # Only the LLM's parameter choice is cached; the pass itself is always
+    # generated fresh from these parameters.
+    user_input = normalize_input(user_input)
+    cache_key = f"{get_params_cache_namespace()}:{user_input}"
+    cached = params_cache.get(cache_key)
+    if cached is not None:
+        expires_at, pass_config = cached
+        if expires_at > monotonic():
+            return pass_config
+
+    # Identical concurrent misses share one in-flight LLM call per cache key;
+    # different inputs never share a request. The task is shielded so one
+    # client disconnecting does not cancel the call for the others.
+    task = pending_pass_configs.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(fetch_pass_config(cache_key, user_input))
+        pending_pass_configs[cache_key] = task
+        task.add_done_callback(lambda _: pending_pass_configs.pop(cache_key, None))
+    return await asyncio.shield(task)
+
+
+async def fetch_pass_config(cache_key: str, user_input: str) -> PassParams:
+    pass_config = await request_pass_config(user_input)
+    # AutoCache ignores its ttl argument, so the expiry time is stored alongside
+    # the cached config and checked on lookup.
+    params_cache.set(cache_key, (monotonic() + LLM_CACHE_TTL, pass_config))
+    return pass_config
 
 
 @asynccontextmanager
@@ -56,6 +158,12 @@ async def lifespan(app: FastAPI):
     logger.info("Starting passai application...")
     _ = pass_generator.word_list
     logger.info("Word list preloaded successfully")
+    get_llm_instruction()
+    logger.info("LLM instruction preloaded successfully")
+    get_params_cache_namespace()
+    logger.info("LLM params cache namespace precomputed successfully")
+    get_index_html()
+    logger.info("Index page prerendered successfully")
     yield
     logger.info("Shutting down passai application...")
 
@@ -80,6 +188,14 @@ async def add_process_time_header(request: Request, call_next):
 
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+
+
+@lru_cache(maxsize=1)
+def get_index_html() -> bytes:
+    # index.html has no per-request context, so it is rendered only once.
+    return templates.get_template("index.html").render().encode("utf-8")
+
+
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 API_KEY = os.getenv("API_KEY")
@@ -88,26 +204,36 @@ if not API_KEY:
     raise ValueError("API_KEY environment variable must be set")
 
 LLM_MODEL = os.getenv("LLM_MODEL", "gemini/gemini-2.0-flash-exp")
-LLM_INSTRUCTION_PATH = Path("data/llm_instruction.md")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_MIN_INPUT_LENGTH = int(os.getenv("LLM_MIN_INPUT_LENGTH", "3"))
+LLM_PROMPT_CACHE = os.getenv("LLM_PROMPT_CACHE", "False").lower() == "true"
+
+
+class GenerateRequest(msgspec.Struct, frozen=True):
+    input: Annotated[str, msgspec.Meta(min_length=1)]
+    publicKey: str
 
 
-class GenerateRequest(BaseModel):
-    input: str = Field(..., min_length=1, description="User's password requirements")
-    publicKey: str = Field(..., description="Client's public key for encryption")
+class GenerateResponse(msgspec.Struct, frozen=True):
+    encryptedPass: str
 
 
-class GenerateResponse(BaseModel):
-    encryptedPass: str = Field(..., description="Encrypted password")
+generate_request_decoder = msgspec.json.Decoder(GenerateRequest)
+generate_response_encoder = msgspec.json.Encoder()
 
 
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
 
 
+@lru_cache(maxsize=512)
+def load_public_key(public_key_pem: str) -> PublicKeyTypes:
+    return serialization.load_pem_public_key(base64.b64decode(public_key_pem))
+
+
 def encrypt_password(password: str, public_key_pem: str) -> str:
     try:
-        public_key_bytes = base64.b64decode(public_key_pem)
-        public_key = serialization.load_pem_public_key(public_key_bytes)
+        public_key = load_public_key(public_key_pem)
         encrypted = public_key.encrypt(  # type: ignore[union-attr]
             password.encode("utf-8"),
             padding.OAEP(
@@ -118,71 +244,85 @@ def encrypt_password(password: str, public_key_pem: str) -> str:
         )
         return base64.b64encode(encrypted).decode("utf-8")
     except Exception as e:
-        logger.error(f"Encryption error: {str(e)}")
+        logger.error("Encryption error: %s", e)
         raise ValueError("Failed to encrypt password")
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+async def index():
+    return HTMLResponse(
+        get_index_html(), headers={"Cache-Control": "public, max-age=300"}
+    )
 
 
 @app.post(
     "/generate",
-    response_model=GenerateResponse,
     responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
-async def generate_pass(request: GenerateRequest):
+async def generate_pass(request: Request):
+    # Decoded with msgspec straight from the raw body, bypassing pydantic
     try:
-        user_input = request.input.strip()
-        public_key = request.publicKey
+        body = generate_request_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        logger.warning("Invalid request body: %s", e)
+        raise HTTPException(
+            status_code=422,
+            detail="Invalid request. Please provide a description and a public key",
+        )
+
+    try:
+        user_input = body.input.strip()
+        public_key = body.publicKey
 
         if not user_input:
             raise HTTPException(
                 status_code=400, detail="Please enter a description for your pass"
             )
 
+        # Too short to describe a pass; not worth an LLM round trip
+        if len(user_input) < LLM_MIN_INPUT_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "Please describe your pass in at least "
+                    f"{LLM_MIN_INPUT_LENGTH} characters"
+                ),
+            )
+
         if not public_key:
             raise HTTPException(
                 status_code=400, detail="Public key required for secure transmission"
             )
 
-        logger.info(f"Processing request: {user_input[:50]}...")
-
-        pass_config = client.chat.completions.create(
-            model=LLM_MODEL,
-            api_key=API_KEY,
-            messages=[
-                {"role": "system", "content": get_llm_instruction()},
-                {"role": "user", "content": user_input},
-            ],
-            response_model=PassParams,
-            max_retries=2,
-        )
+        logger.info("Processing request: %.50s...", user_input)
 
-        if pass_config.type == "password" and pass_config.password:
-            result = pass_generator.generate_password(
-                **pass_config.password.model_dump()
-            )
-        elif pass_config.type == "passphrase" and pass_config.passphrase:
-            result = pass_generator.generate_passphrase(
-                **pass_config.passphrase.model_dump()
-            )
-        else:
+        pass_config = await resolve_pass_config(user_input)
+
+        # The config lives in the field named after its type, e.g. .password
+        generate = PASS_GENERATORS.get(pass_config.type)
+        config = getattr(pass_config, pass_config.type, None)
+        if generate is None or config is None:
             raise HTTPException(status_code=400, detail="Invalid pass configuration")
 
-        encrypted_pass = encrypt_password(result, public_key)
+        result = generate(config)
+
+        encrypted_pass = await asyncio.to_thread(encrypt_password, result, public_key)
 
         logger.info("Successfully generated and encrypted pass")
-        return GenerateResponse(encryptedPass=encrypted_pass)
+        return Response(
+            generate_response_encoder.encode(
+                GenerateResponse(encryptedPass=encrypted_pass)
+            ),
+            media_type="application/json",
+        )
 
     except HTTPException:
         raise
     except ValueError as e:
-        logger.warning(f"Validation error: {str(e)}")
+        logger.warning("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid parameters: {str(e)}")
     except Exception as e:
-        logger.error(f"Error generating pass: {str(e)}", exc_info=True)
+        logger.error("Error generating pass: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500, detail="Failed to generate pass. Please try again."
         )
@@ -194,8 +334,17 @@ if __name__ == "__main__":
     debug_mode = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     host = os.getenv("FLASK_HOST", "0.0.0.0")
     port = int(os.getenv("FLASK_PORT", "5000"))
+    workers = int(os.getenv("FLASK_WORKERS", str(os.cpu_count() or 1)))
 
     logger.info(
-        f"Starting application in {'debug' if debug_mode else 'production'} mode"
+        "Starting application in %s mode", "debug" if debug_mode else "production"
+    )
+    uvicorn.run(
+        "app:app",
+        host=host,
+        port=port,
+        reload=debug_mode,
+        # The reloader only supports a single worker process
+        workers=1 if debug_mode else workers,
+        log_level="info",
     )
-    uvicorn.run("app:app", host=host, port=port, reload=debug_mode, log_level="info")
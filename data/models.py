@@ -1,8 +1,10 @@
 from typing import Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PasswordParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     length: int = Field(..., gt=0, description="Total length of the password")
     uppercase: tuple[bool, int] = Field(
         default=(True, 1), description="Include uppercase letters"
@@ -22,6 +24,8 @@ class PasswordParams(BaseModel):
 
 
 class PassphraseParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     length: int = Field(..., gt=0, description="Number of words in the passphrase")
     numbers: tuple[bool, int] = Field(default=(False, 0), description="Include numbers")
     special_characters: tuple[bool, int, list[str] | Literal["auto"]] = Field(
@@ -36,6 +40,8 @@ class PassphraseParams(BaseModel):
 
 
 class PassParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["password", "passphrase"] = Field(
         ..., description="Type of pass to generate"
     )
@@ -1,8 +1,100 @@
+import os
 import secrets
 import string
+from collections.abc import Iterable, Sequence
 from pathlib import Path
-from typing import Literal
-from functools import cached_property
+from types import MappingProxyType
+from typing import Literal, TypeVar
+from functools import cache, lru_cache
+
+from data.models import PasswordParams, PassphraseParams
+
+T = TypeVar("T")
+
+WORDS_FILE = Path(__file__).parent / "data" / "words.txt"
+
+_SYSRAND = secrets.SystemRandom()
+
+
+@cache
+def _load_words() -> tuple[str, ...]:
+    return tuple(WORDS_FILE.read_text(encoding="utf-8").split())
+
+
+def _apply_case(word: str, easy_to: str) -> str:
+    return word.lower() if easy_to == "type" else word.capitalize()
+
+
+@cache
+def _cased_words(easy_to: str) -> tuple[str, ...]:
+    return tuple(_apply_case(word, easy_to) for word in _load_words())
+
+
+@lru_cache(maxsize=32)
+def _filtered_words(easy_to: str, exclude: frozenset[str]) -> tuple[str, ...]:
+    return tuple(
+        cased_word
+        for word, cased_word in zip(_load_words(), _cased_words(easy_to))
+        if exclude.isdisjoint(word)
+    )
+
+
+def _delete_table(exclude: Iterable[str]) -> dict[int, None]:
+    # Only single characters can ever match a character of a set
+    return str.maketrans(dict.fromkeys(c for c in exclude if len(c) == 1))
+
+
+@lru_cache(maxsize=64)
+def _pick_table(pool: bytes) -> tuple[bytes, bytes]:
+    # Maps each random byte, masked down to the next power of two above
+    # len(pool), onto a pool character; out-of-range values are deleted.
+    size = len(pool)
+    mask = (1 << (size - 1).bit_length()) - 1
+    table = bytes(pool[b & mask] if b & mask < size else 0 for b in range(256))
+    rejected = bytes(b for b in range(256) if b & mask >= size)
+    return table, rejected
+
+
+def _bulk_pick(pool: str, n: int) -> str:
+    if not pool:
+        raise ValueError("Cannot pick characters from an empty pool")
+    if n <= 0:
+        return ""
+    if len(pool) > 256 or not pool.isascii():
+        return "".join(_SYSRAND.choices(pool, k=n))
+
+    # Rejection sampling over whole os.urandom() buffers, done in C by
+    # bytes.translate(); the result is decoded to str only once.
+    table, rejected = _pick_table(pool.encode("ascii"))
+    picks = b""
+    while len(picks) < n:
+        picks += os.urandom(2 * (n - len(picks)) + 16).translate(table, rejected)
+    return picks[:n].decode("ascii")
+
+
+def _bulk_choice(seq: Sequence[T], n: int) -> list[T]:
+    # One 64-bit draw per pick reduced modulo len(seq); the modulo bias is at
+    # most len(seq) / 2**64, so no rejection loop is needed.
+    size = len(seq)
+    return [seq[d % size] for d in memoryview(os.urandom(8 * n)).cast("Q")]
+
+
+def _shuffle(items: list) -> None:
+    # Fisher-Yates with 32-bit swap indices read from one os.urandom() buffer,
+    # masked and rejected like _bulk_pick to stay unbiased.
+    draws = memoryview(os.urandom(8 * len(items))).cast("I")
+    pos = 0
+    for i in range(len(items) - 1, 0, -1):
+        mask = (1 << i.bit_length()) - 1
+        while True:
+            if pos == len(draws):
+                draws = memoryview(os.urandom(8 * i + 8)).cast("I")
+                pos = 0
+            j = draws[pos] & mask
+            pos += 1
+            if j <= i:
+                break
+        items[i], items[j] = items[j], items[i]
 
 
 class PassGenerator:
@@ -13,226 +105,177 @@ class PassGenerator:
     EASY_READ_SPECIAL = "!@#$%^&*-+="
     FULL_SPECIAL = "!@#$%^&*()_+-=[]{}|;:,.<>?"
 
-    @cached_property
-    def word_list(self) -> list[str]:
-        words_file = Path(__file__).parent / "data" / "words.txt"
-        with open(words_file, encoding="utf-8") as f:
-            return [word.strip() for word in f if word.strip()]
+    # Pool for each easy_to setting; anything else gets the full pool
+    UPPERCASE_BY_EASY_TO = {"type": EASY_TYPE_UPPERCASE}
+    LOWERCASE_BY_EASY_TO = {"type": EASY_TYPE_LOWERCASE}
+    NUMBERS_BY_EASY_TO = {"read": EASY_READ_NUMBERS}
+    SPECIAL_BY_EASY_TO = {"type": EASY_TYPE_SPECIAL, "read": EASY_READ_SPECIAL}
 
+    @property
+    def word_list(self) -> tuple[str, ...]:
+        return _load_words()
+
+    @classmethod
     def _get_special_chars(
-        self, easy_to: str, custom_chars: list[str] | Literal["auto"]
+        cls, easy_to: str, custom_chars: list[str] | tuple[str, ...] | Literal["auto"]
     ) -> str:
         if custom_chars != "auto":
             return "".join(custom_chars)
 
-        match easy_to:
-            case "type":
-                return self.EASY_TYPE_SPECIAL
-            case "read":
-                return self.EASY_READ_SPECIAL
-            case _:
-                return self.FULL_SPECIAL
+        return cls.SPECIAL_BY_EASY_TO.get(easy_to, cls.FULL_SPECIAL)
 
+    # Cached per distinct settings, so list arguments are passed as tuples and
+    # the result is returned read-only.
+    @classmethod
+    @lru_cache(maxsize=128)
     def _build_char_sets(
-        self,
+        cls,
         uppercase: bool,
         lowercase: bool,
         numbers: bool,
         special: bool,
-        special_chars: list[str] | Literal["auto"],
+        special_chars: tuple[str, ...] | Literal["auto"],
         easy_to: str,
-        include: list[str],
-        exclude: list[str],
-    ) -> dict[str, str]:
+        include: tuple[str, ...],
+        exclude: tuple[str, ...],
+    ) -> tuple[MappingProxyType[str, str], str]:
         char_sets = {}
 
         if uppercase:
-            char_sets["uppercase"] = (
-                self.EASY_TYPE_UPPERCASE
-                if easy_to == "type"
-                else string.ascii_uppercase
+            char_sets["uppercase"] = cls.UPPERCASE_BY_EASY_TO.get(
+                easy_to, string.ascii_uppercase
             )
 
         if lowercase:
-            char_sets["lowercase"] = (
-                self.EASY_TYPE_LOWERCASE
-                if easy_to == "type"
-                else string.ascii_lowercase
+            char_sets["lowercase"] = cls.LOWERCASE_BY_EASY_TO.get(
+                easy_to, string.ascii_lowercase
             )
 
         if numbers:
-            char_sets["numbers"] = (
-                self.EASY_READ_NUMBERS if easy_to == "read" else string.digits
-            )
+            char_sets["numbers"] = cls.NUMBERS_BY_EASY_TO.get(easy_to, string.digits)
 
         if special:
-            char_sets["special"] = self._get_special_chars(easy_to, special_chars)
+            char_sets["special"] = cls._get_special_chars(easy_to, special_chars)
 
         if include:
             char_sets["custom"] = "".join(include)
 
         if exclude:
-            exclude_set = set(exclude)
+            delete_table = _delete_table(exclude)
             char_sets = {
-                key: "".join(c for c in value if c not in exclude_set)
+                key: value.translate(delete_table)
                 for key, value in char_sets.items()
                 if value
             }
 
-        return char_sets
-
-    def generate_password(
-        self,
-        length: int,
-        uppercase: tuple[bool, int] = (True, 1),
-        lowercase: tuple[bool, int] = (True, 1),
-        numbers: tuple[bool, int] = (True, 1),
-        special_characters: tuple[bool, int, list[str] | Literal["auto"]] = (
-            True,
-            1,
-            "auto",
-        ),
-        include: list[str] | None = None,
-        exclude: list[str] | None = None,
-        easy_to: Literal["read", "type"] = "read",
-    ) -> str:
-        include = include or []
-        exclude = exclude or []
+        return MappingProxyType(char_sets), "".join(char_sets.values())
+
+    def generate_password(self, params: PasswordParams) -> str:
+        length = params.length
+        uppercase = params.uppercase
+        lowercase = params.lowercase
+        numbers = params.numbers
+        special_characters = params.special_characters
+        include = params.include or []
+        exclude = params.exclude or []
+        easy_to = params.easy_to
 
         if length <= 0:
             raise ValueError("Password length must be greater than 0")
 
-        min_chars_needed = sum(
-            [
-                uppercase[1] if uppercase[0] else 0,
-                lowercase[1] if lowercase[0] else 0,
-                numbers[1] if numbers[0] else 0,
-                special_characters[1] if special_characters[0] else 0,
-            ]
+        # (set name, enabled, minimum count), in _build_char_sets argument order
+        specs = (
+            ("uppercase", uppercase[0], uppercase[1]),
+            ("lowercase", lowercase[0], lowercase[1]),
+            ("numbers", numbers[0], numbers[1]),
+            ("special", special_characters[0], special_characters[1]),
         )
+        min_chars_needed = sum(min_count for _, enabled, min_count in specs if enabled)
 
         if min_chars_needed > length:
             if numbers[0] and numbers[1] == length:
-                uppercase = (False, 0)
-                lowercase = (False, 0)
-                special_characters = (False, 0, special_characters[2])
-                min_chars_needed = numbers[1]
+                specs = tuple(
+                    (name, name == "numbers", min_count) for name, _, min_count in specs
+                )
             else:
                 raise ValueError(
                     f"Password length {length} is too short for minimum character requirements ({min_chars_needed})"
                 )
 
-        char_sets = self._build_char_sets(
-            uppercase[0],
-            lowercase[0],
-            numbers[0],
-            special_characters[0],
-            special_characters[2],
+        special_chars = special_characters[2]
+        if special_chars != "auto":
+            special_chars = tuple(special_chars)
+
+        char_sets, all_chars = self._build_char_sets(
+            *(enabled for _, enabled, _ in specs),
+            special_chars,
             easy_to,
-            include,
-            exclude,
+            tuple(include),
+            tuple(exclude),
         )
 
         if not char_sets:
             raise ValueError("No character sets available for password generation")
 
-        all_chars = "".join(char_sets.values())
         if not all_chars:
             raise ValueError("No valid characters available after applying exclusions")
 
-        password_chars = []
-
-        if uppercase[0] and "uppercase" in char_sets and char_sets["uppercase"]:
-            password_chars.extend(
-                secrets.choice(char_sets["uppercase"]) for _ in range(uppercase[1])
-            )
-
-        if lowercase[0] and "lowercase" in char_sets and char_sets["lowercase"]:
-            password_chars.extend(
-                secrets.choice(char_sets["lowercase"]) for _ in range(lowercase[1])
-            )
-
-        if numbers[0] and "numbers" in char_sets and char_sets["numbers"]:
-            password_chars.extend(
-                secrets.choice(char_sets["numbers"]) for _ in range(numbers[1])
-            )
+        picks = []
 
-        if special_characters[0] and "special" in char_sets and char_sets["special"]:
-            password_chars.extend(
-                secrets.choice(char_sets["special"])
-                for _ in range(special_characters[1])
-            )
+        for name, enabled, min_count in specs:
+            pool = char_sets.get(name)
+            if enabled and pool:
+                picks.append(_bulk_pick(pool, min_count))
 
-        password_chars.extend(
-            secrets.choice(all_chars) for _ in range(length - len(password_chars))
-        )
+        picked = sum(map(len, picks))
+        picks.append(_bulk_pick(all_chars, length - picked))
 
-        secrets.SystemRandom().shuffle(password_chars)
+        password_chars = list("".join(picks))
+        _shuffle(password_chars)
 
         return "".join(password_chars)
 
-    def generate_passphrase(
-        self,
-        length: int,
-        numbers: tuple[bool, int] = (False, 0),
-        special_characters: tuple[bool, int, list[str] | Literal["auto"]] = (
-            False,
-            0,
-            ["@"],
-        ),
-        include: list[str] | None = None,
-        exclude: list[str] | None = None,
-        easy_to: Literal["read", "type"] = "read",
-        separator: str = " ",
-    ) -> str:
-        include = include or []
-        exclude = exclude or []
+    def generate_passphrase(self, params: PassphraseParams) -> str:
+        length = params.length
+        numbers = params.numbers
+        special_characters = params.special_characters
+        include = params.include or []
+        exclude = params.exclude or []
+        easy_to = params.easy_to
+        separator = params.separator
 
         if length <= 0:
             raise ValueError("Passphrase length must be greater than 0")
 
-        word_list = self.word_list.copy()
+        # The cached tuples are only read, so they are copied only to add words
         if exclude:
-            exclude_set = set(exclude)
-            word_list = [
-                word
-                for word in word_list
-                if not any(char in exclude_set for char in word)
-            ]
+            word_list = _filtered_words(easy_to, frozenset(exclude))
+        else:
+            word_list = _cased_words(easy_to)
 
         if include:
-            word_list.extend(include)
+            word_list += tuple(_apply_case(word, easy_to) for word in include)
 
         if not word_list:
             raise ValueError("No valid words available after applying exclusions")
 
-        match easy_to:
-            case "type":
-                passphrase_words = [
-                    secrets.choice(word_list).lower() for _ in range(length)
-                ]
-            case _:
-                passphrase_words = [
-                    secrets.choice(word_list).capitalize() for _ in range(length)
-                ]
+        passphrase_words = _bulk_choice(word_list, length)
 
         extras = []
 
         if numbers[0] and numbers[1] > 0:
-            num_range = range(2, 10) if easy_to == "read" else range(10)
-            extras.extend(str(secrets.choice(num_range)) for _ in range(numbers[1]))
+            digits = self.NUMBERS_BY_EASY_TO.get(easy_to, string.digits)
+            extras.extend(_bulk_pick(digits, numbers[1]))
 
         if special_characters[0] and special_characters[1] > 0:
             special_chars = self._get_special_chars(easy_to, special_characters[2])
             if exclude:
-                special_chars = "".join(c for c in special_chars if c not in exclude)
+                special_chars = special_chars.translate(_delete_table(exclude))
             if special_chars:
-                extras.extend(
-                    secrets.choice(special_chars) for _ in range(special_characters[1])
-                )
+                extras.extend(_bulk_pick(special_chars, special_characters[1]))
 
         all_parts = passphrase_words + extras
-        secrets.SystemRandom().shuffle(all_parts)
+        _shuffle(all_parts)
 
         return separator.join(all_parts)
 
@@ -241,21 +284,25 @@ if __name__ == "__main__":
     gen = PassGenerator()
     print("Example password:")
     pw = gen.generate_password(
-        length=30,
-        uppercase=(True, 2),
-        lowercase=(True, 2),
-        numbers=(True, 2),
-        special_characters=(True, 3, ["@", "#", "$"]),
-        easy_to="read",
+        PasswordParams(
+            length=30,
+            uppercase=(True, 2),
+            lowercase=(True, 2),
+            numbers=(True, 2),
+            special_characters=(True, 3, ["@", "#", "$"]),
+            easy_to="read",
+        )
     )
     print(pw)
 
     print("\nExample passphrase:")
     ph = gen.generate_passphrase(
-        length=5,
-        numbers=(True, 1),
-        special_characters=(True, 1, "auto"),
-        easy_to="read",
-        separator="-",
+        PassphraseParams(
+            length=5,
+            numbers=(True, 1),
+            special_characters=(True, 1, "auto"),
+            easy_to="read",
+            separator="-",
+        )
     )
     print(ph)
@@ -1,6 +1,8 @@
 class PassAI {
   #keyPair = null;
+  #publicKey = null;
   #timeoutId = null;
+  #abortController = null;
 
   constructor() {
     this.initializeElements();
@@ -21,6 +23,8 @@ class PassAI {
         true,
         ["encrypt", "decrypt"]
       );
+      // The key pair never changes, so its export is reused by every request
+      this.#publicKey = await this.exportPublicKey();
       console.log("Encryption keys generated");
     } catch (err) {
       console.error("Failed to generate encryption keys:", err);
@@ -182,6 +186,9 @@ class PassAI {
   }
 
   async generatePass(input) {
+    // A newer input supersedes any request still in flight
+    this.#abortController?.abort();
+
     if (!input.trim()) {
       this.transitionToPlaceholder();
       this.hideLoading();
@@ -194,10 +201,12 @@ class PassAI {
       return;
     }
 
+    const controller = new AbortController();
+    this.#abortController = controller;
     this.showLoading();
 
     try {
-      const publicKey = await this.exportPublicKey();
+      const publicKey = this.#publicKey ?? (await this.exportPublicKey());
 
       const response = await fetch("/generate", {
         method: "POST",
@@ -208,16 +217,19 @@ class PassAI {
           input,
           publicKey,
         }),
+        signal: controller.signal,
       });
 
       const data = await response.json();
+      if (controller.signal.aborted) return;
       this.hideLoading();
 
-      if (data.error) {
-        this.showError(data.error);
+      if (data.error || data.detail) {
+        this.showError(data.error || data.detail);
         this.transitionToPlaceholder();
       } else if (data.encryptedPass) {
         const decryptedPass = await this.decryptPassword(data.encryptedPass);
+        if (controller.signal.aborted) return;
         this.hideError();
         this.transitionToPass(decryptedPass);
         await this.copyToClipboard(decryptedPass);
@@ -227,6 +239,7 @@ class PassAI {
         this.transitionToPlaceholder();
       }
     } catch (err) {
+      if (err.name === "AbortError") return;
       this.hideLoading();
       this.showError("Failed to generate pass. Please try again.");
       console.error("API Error:", err);
@@ -0,0 +1,218 @@
+import asyncio
+import base64
+import os
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from fastapi.testclient import TestClient
+from instructor.cache import AutoCache
+from instructor.utils.core import prepare_response_model
+
+os.environ.setdefault("API_KEY", "test-key")
+
+import app  # noqa: E402
+from data.models import PassParams, PasswordParams  # noqa: E402
+
+PASS_CONFIG = PassParams(type="password", password=PasswordParams(length=14))
+
+
+@pytest.fixture(scope="module")
+def private_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="module")
+def public_key(private_key) -> str:
+    pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.b64encode(pem).decode()
+
+
+@pytest.fixture
+def llm_calls(monkeypatch) -> list[str]:
+    calls = []
+
+    async def fake_request_pass_config(user_input: str) -> PassParams:
+        calls.append(user_input)
+        return PASS_CONFIG
+
+    monkeypatch.setattr(app, "request_pass_config", fake_request_pass_config)
+    monkeypatch.setattr(app, "params_cache", AutoCache(maxsize=16))
+    app.get_params_cache_namespace.cache_clear()
+    yield calls
+    app.get_params_cache_namespace.cache_clear()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(app, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app.app) as client:
+        yield client
+
+
+def generate(client, public_key, user_input):
+    return client.post("/generate", json={"input": user_input, "publicKey": public_key})
+
+
+def decrypt(private_key, encrypted_pass: str) -> str:
+    return private_key.decrypt(
+        base64.b64decode(encrypted_pass),
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        ),
+    ).decode()
+
+
+def test_normalize_input():
+    assert app.normalize_input("  a  strong\n\tpassword ") == "a strong password"
+
+
+def test_generate_returns_encrypted_pass(client, public_key, private_key, llm_calls):
+    response = generate(client, public_key, "a strong password")
+
+    assert response.status_code == 200
+    assert len(decrypt(private_key, response.json()["encryptedPass"])) == 14
+    assert llm_calls == ["a strong password"]
+
+
+def test_whitespace_variants_hit_the_cache(client, public_key, private_key, llm_calls):
+    passes = [
+        decrypt(private_key, generate(client, public_key, text).json()["encryptedPass"])
+        for text in ("a strong password", "  a  strong\npassword ")
+    ]
+
+    assert llm_calls == ["a strong password"]
+    # Only the parameters are cached; each pass is generated fresh
+    assert passes[0] != passes[1]
+
+
+def test_cache_entry_expires_after_ttl(client, public_key, llm_calls, clock):
+    generate(client, public_key, "a strong password")
+    clock[0] += app.LLM_CACHE_TTL - 1
+    generate(client, public_key, "a strong password")
+    assert len(llm_calls) == 1
+
+    clock[0] += 2
+    generate(client, public_key, "a strong password")
+    assert len(llm_calls) == 2
+
+
+def test_cache_is_namespaced_by_model(client, public_key, llm_calls, monkeypatch):
+    generate(client, public_key, "a strong password")
+    monkeypatch.setattr(app, "LLM_MODEL", "other/model")
+    app.get_params_cache_namespace.cache_clear()
+    generate(client, public_key, "a strong password")
+
+    assert len(llm_calls) == 2
+
+
+@pytest.mark.parametrize("user_input", ["ab", "  a  ", "\n"])
+def test_short_input_never_reaches_the_llm(client, public_key, llm_calls, user_input):
+    response = generate(client, public_key, user_input)
+
+    assert response.status_code == 400
+    assert llm_calls == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"not json",
+        b'{"input": "a strong password"}',
+        b'{"input": "", "publicKey": "key"}',
+        b'{"input": 5, "publicKey": "key"}',
+    ],
+)
+def test_malformed_body_never_reaches_the_llm(client, llm_calls, body):
+    response = client.post(
+        "/generate", content=body, headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "Invalid request. Please provide a description and a public key"
+    }
+    assert llm_calls == []
+
+
+def test_concurrent_identical_misses_share_one_llm_call(monkeypatch):
+    calls = []
+
+    async def slow_request_pass_config(user_input: str) -> PassParams:
+        calls.append(user_input)
+        await asyncio.sleep(0.01)
+        return PASS_CONFIG
+
+    monkeypatch.setattr(app, "request_pass_config", slow_request_pass_config)
+    monkeypatch.setattr(app, "params_cache", AutoCache(maxsize=16))
+
+    async def resolve_all():
+        return await asyncio.gather(
+            *(app.resolve_pass_config(" a strong  password") for _ in range(5)),
+            app.resolve_pass_config("a long passphrase"),
+        )
+
+    results = asyncio.run(resolve_all())
+
+    assert results == [PASS_CONFIG] * 6
+    assert sorted(calls) == ["a long passphrase", "a strong password"]
+    assert app.pending_pass_configs == {}
+
+
+def test_failed_in_flight_call_is_not_cached(monkeypatch):
+    calls = []
+
+    async def failing_request_pass_config(user_input: str) -> PassParams:
+        calls.append(user_input)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(app, "request_pass_config", failing_request_pass_config)
+    monkeypatch.setattr(app, "params_cache", AutoCache(maxsize=16))
+
+    async def resolve_all():
+        return await asyncio.gather(
+            *(app.resolve_pass_config("a strong password") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    for _ in range(2):
+        results = asyncio.run(resolve_all())
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    assert len(calls) == 2
+    assert app.pending_pass_configs == {}
+
+
+def test_response_model_wrapper_is_reused(monkeypatch):
+    models = []
+
+    async def fake_create(**kwargs):
+        models.append(kwargs["response_model"])
+        return PASS_CONFIG
+
+    monkeypatch.setattr(app.client.chat.completions, "create", fake_create)
+    asyncio.run(app.request_pass_config("a strong password"))
+
+    assert models == [app.pass_params_model]
+    assert prepare_response_model(app.pass_params_model) is app.pass_params_model
+
+
+def test_response_model_schema_is_copied():
+    schema = app.pass_params_model.model_json_schema()
+    assert schema == PassParams.model_json_schema()
+
+    schema["properties"].clear()
+    schema["title"] = "Changed"
+
+    assert app.pass_params_model.model_json_schema() == PassParams.model_json_schema()
@@ -0,0 +1,244 @@
+import string
+from collections import Counter
+from itertools import permutations
+
+import pytest
+
+from data.models import PassphraseParams, PasswordParams
+from pass_generator import PassGenerator, _bulk_choice, _bulk_pick, _shuffle
+
+RUNS = 200
+
+
+@pytest.fixture(scope="module")
+def generator() -> PassGenerator:
+    return PassGenerator()
+
+
+def count_in(password: str, pool: str) -> int:
+    return sum(c in pool for c in password)
+
+
+@pytest.mark.parametrize(
+    "params, pools",
+    [
+        (
+            PasswordParams(length=16),
+            {
+                "uppercase": string.ascii_uppercase,
+                "lowercase": string.ascii_lowercase,
+                "numbers": PassGenerator.EASY_READ_NUMBERS,
+                "special": PassGenerator.EASY_READ_SPECIAL,
+            },
+        ),
+        (
+            PasswordParams(
+                length=12,
+                uppercase=(True, 3),
+                lowercase=(True, 2),
+                numbers=(True, 4),
+                special_characters=(True, 3, "auto"),
+                easy_to="type",
+            ),
+            {
+                "uppercase": PassGenerator.EASY_TYPE_UPPERCASE,
+                "lowercase": PassGenerator.EASY_TYPE_LOWERCASE,
+                "numbers": string.digits,
+                "special": PassGenerator.EASY_TYPE_SPECIAL,
+            },
+        ),
+        (
+            PasswordParams(
+                length=40,
+                uppercase=(False, 0),
+                lowercase=(True, 10),
+                numbers=(True, 5),
+                special_characters=(True, 5, ["@", "#"]),
+            ),
+            {
+                "lowercase": string.ascii_lowercase,
+                "numbers": PassGenerator.EASY_READ_NUMBERS,
+                "special": "@#",
+            },
+        ),
+    ],
+)
+def test_password_length_and_minimum_counts(generator, params, pools):
+    minimums = {
+        "uppercase": params.uppercase[1],
+        "lowercase": params.lowercase[1],
+        "numbers": params.numbers[1],
+        "special": params.special_characters[1],
+    }
+    allowed = "".join(pools.values())
+
+    for _ in range(RUNS):
+        password = generator.generate_password(params)
+        assert len(password) == params.length
+        assert set(password) <= set(allowed)
+        for name, pool in pools.items():
+            assert count_in(password, pool) >= minimums[name]
+
+
+def test_password_numbers_only_when_minimum_fills_length(generator):
+    params = PasswordParams(length=6, uppercase=(True, 2), numbers=(True, 6))
+
+    for _ in range(RUNS):
+        password = generator.generate_password(params)
+        assert len(password) == 6
+        assert set(password) <= set(PassGenerator.EASY_READ_NUMBERS)
+
+
+def test_password_minimums_longer_than_length(generator):
+    params = PasswordParams(length=4, uppercase=(True, 3), lowercase=(True, 3))
+
+    with pytest.raises(ValueError):
+        generator.generate_password(params)
+
+
+def test_password_excluded_characters_never_appear(generator):
+    exclude = list("O0lI1")
+    params = PasswordParams(length=32, exclude=exclude, easy_to="type")
+
+    for _ in range(RUNS):
+        assert set(generator.generate_password(params)).isdisjoint(exclude)
+
+
+def test_password_set_emptied_by_exclusions_is_skipped(generator):
+    params = PasswordParams(
+        length=16, special_characters=(True, 2, ["@"]), exclude=["@"]
+    )
+
+    for _ in range(RUNS):
+        password = generator.generate_password(params)
+        assert len(password) == 16
+        assert "@" not in password
+
+
+def test_password_all_pools_emptied_by_exclusions(generator):
+    params = PasswordParams(
+        length=8,
+        uppercase=(False, 0),
+        lowercase=(False, 0),
+        numbers=(True, 1),
+        special_characters=(False, 0, "auto"),
+        exclude=list(PassGenerator.EASY_READ_NUMBERS),
+    )
+
+    with pytest.raises(ValueError):
+        generator.generate_password(params)
+
+
+def test_password_non_ascii_characters(generator):
+    params = PasswordParams(
+        length=20, special_characters=(True, 4, ["€", "é"]), include=["ß"]
+    )
+
+    for _ in range(RUNS):
+        password = generator.generate_password(params)
+        assert len(password) == 20
+        assert count_in(password, "€é") >= 4
+
+
+def test_passphrase_word_and_extra_counts(generator):
+    params = PassphraseParams(
+        length=5,
+        numbers=(True, 2),
+        special_characters=(True, 1, ["@"]),
+        separator=" ",
+    )
+
+    for _ in range(RUNS):
+        parts = generator.generate_passphrase(params).split(" ")
+        assert len(parts) == 8
+        assert sum(part.isdigit() for part in parts) == 2
+        assert parts.count("@") == 1
+        assert sum(part.isalpha() for part in parts) == 5
+
+
+def test_passphrase_excluded_characters_never_appear(generator):
+    params = PassphraseParams(length=6, exclude=["e", "a"])
+
+    for _ in range(RUNS):
+        passphrase = generator.generate_passphrase(params).lower()
+        assert "e" not in passphrase and "a" not in passphrase
+
+
+def test_passphrase_all_words_emptied_by_exclusions(generator):
+    params = PassphraseParams(length=4, exclude=list(string.ascii_lowercase))
+
+    with pytest.raises(ValueError):
+        generator.generate_passphrase(params)
+
+
+def test_bulk_pick_edge_cases():
+    assert _bulk_pick("abc", 0) == ""
+    with pytest.raises(ValueError):
+        _bulk_pick("", 5)
+
+
+def test_bulk_pick_non_ascii_fallback():
+    picks = _bulk_pick("é€a", 3000)
+    assert len(picks) == 3000
+    assert set(picks) == set("é€a")
+
+
+# The bounds below sit more than five standard deviations from the expected
+# counts, so they only fail on real bias.
+
+
+@pytest.mark.parametrize(
+    "pool", ["abc", PassGenerator.EASY_READ_NUMBERS, string.ascii_letters + "!@"]
+)
+def test_bulk_pick_is_uniform(pool):
+    per_char = 3000
+    counts = Counter(_bulk_pick(pool, per_char * len(pool)))
+
+    assert set(counts) == set(pool)
+    for count in counts.values():
+        assert abs(count - per_char) < per_char * 0.1
+
+
+def test_bulk_choice_is_uniform():
+    per_item = 10000
+    counts = Counter(_bulk_choice(range(7), per_item * 7))
+
+    assert set(counts) == set(range(7))
+    for count in counts.values():
+        assert abs(count - per_item) < per_item * 0.05
+
+
+def test_shuffle_keeps_items():
+    items = list("aabbcdefgh")
+    _shuffle(items)
+    assert sorted(items) == list("aabbcdefgh")
+
+
+def test_shuffle_is_uniform():
+    per_permutation = 10000
+    counts = Counter()
+    for _ in range(per_permutation * 6):
+        items = [0, 1, 2]
+        _shuffle(items)
+        counts[tuple(items)] += 1
+
+    assert set(counts) == set(permutations([0, 1, 2]))
+    for count in counts.values():
+        assert abs(count - per_permutation) < per_permutation * 0.05
+
+
+def test_generators_accept_unhashable_params(generator):
+    # Frozen models with list fields are not hashable, so nothing may use
+    # them as cache keys; the memoised helpers take tuples instead.
+    password_params = PasswordParams(
+        length=12, special_characters=(True, 2, ["@"]), include=["x"], exclude=["0"]
+    )
+    passphrase_params = PassphraseParams(length=4, include=["Zebra"], exclude=["q"])
+
+    for params in (password_params, passphrase_params):
+        with pytest.raises(TypeError):
+            hash(params)
+
+    for _ in range(2):
+        assert len(generator.generate_password(password_params)) == 12
+        assert generator.generate_passphrase(passphrase_params)